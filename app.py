@@ -7,11 +7,12 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
 from collections import Counter
+from functools import lru_cache
 import re
 
+from sentiment_core import analyze_responses, detect_question_context
+
 # ==================== COLOR SCHEME CONFIGURATION ====================
 # Google Maps-Inspired Vibrant Orange & Blue Theme
 COLOR_SCHEME = {
@@ -44,6 +45,13 @@ COLOR_SCHEME = {
     'wordcloud_cmap': 'plasma'        # Vibrant purple-orange-yellow gradient
 }
 
+# Sentiment label -> chart color, kept next to COLOR_SCHEME
+SENTIMENT_COLORS = {
+    'Positive': COLOR_SCHEME['positive'],
+    'Neutral': COLOR_SCHEME['neutral'],
+    'Negative': COLOR_SCHEME['negative']
+}
+
 # Page configuration
 st.set_page_config(
     page_title="Presales Survey Analysis",
@@ -99,7 +107,14 @@ st.markdown(f"""
 def load_data():
     """Load and parse raw survey data - returns both open-ended and multiple choice"""
     try:
-        df = pd.read_csv('raw-data.csv', encoding='utf-8-sig')
+        # Only the question/response columns are used - skip the rest and read as
+        # plain text instead of letting pandas infer a dtype per column
+        df = pd.read_csv(
+            'raw-data.csv',
+            encoding='utf-8-sig',
+            usecols=lambda col: col.strip() in ('Question', 'Response', 'Responses'),
+            dtype=str
+        )
         df.columns = df.columns.str.strip()  # Clean column names
 
         # Handle different possible column names
@@ -115,7 +130,7 @@ def load_data():
 
         # Separate open-ended from multiple choice questions
         # Multiple choice questions have numeric responses (vote counts)
-        df['Is_Numeric'] = df['Response'].str.match(r'^\d+$', na=False)
+        df['Is_Numeric'] = df['Response'].str.isdecimal()
 
         open_ended = df[~df['Is_Numeric']].copy()
         multiple_choice = df[df['Is_Numeric']].copy()
@@ -163,21 +178,30 @@ def get_multiple_choice_data():
 @st.cache_data
 def get_question_summary(df):
     """Generate summary statistics by question"""
-    summary = df.groupby('Question').agg({
-        'Response': ['count', lambda x: x.nunique()]
-    }).reset_index()
+    summary = df.groupby('Question')['Response'].agg(['count', 'nunique']).reset_index()
     summary.columns = ['Question', 'Total Responses', 'Unique Responses']
     return summary
 
+@st.cache_resource
+def get_question_groups(_df):
+    """Partition responses by question once - views look up rows here instead of re-masking df (read-only)"""
+    # _df is not hashed (a per-call hash costs more than the masks this replaces);
+    # it is always the frame from the cached load_data(), so one entry is enough
+    return dict(tuple(_df.groupby('Question', sort=False)))
+
 # ==================== HELPER FUNCTIONS ====================
 
+# Runs of punctuation and/or whitespace - clean_text() collapses each run to a
+# single space in one pass
+NON_WORD_REGEX = re.compile(r'\W+')
+
+@lru_cache(maxsize=4096)
 def clean_text(text):
-    """Clean text for analysis"""
+    """Clean text for analysis (memoized within a render - the word cloud and top-word count clean the same responses)"""
     if pd.isna(text):
         return ""
     text = str(text).lower()
-    text = re.sub(r'[^\w\s]', ' ', text)
-    text = re.sub(r'\s+', ' ', text)
+    text = NON_WORD_REGEX.sub(' ', text)
     return text.strip()
 
 def get_top_words(responses, top_n=20, exclude_words=None):
@@ -201,6 +225,10 @@ def get_top_words(responses, top_n=20, exclude_words=None):
 
 def create_wordcloud(responses, title="Word Cloud"):
     """Generate word cloud from responses"""
+    # Imported lazily - only the word cloud views need wordcloud/matplotlib
+    from wordcloud import WordCloud
+    import matplotlib.pyplot as plt
+
     text = ' '.join([clean_text(r) for r in responses])
 
     if not text.strip():
@@ -257,9 +285,9 @@ def create_response_distribution(df):
     question_counts.columns = ['Question', 'Count']
 
     # Shorten question labels for better display
-    question_counts['Short_Question'] = question_counts['Question'].apply(
-        lambda x: x[:50] + '...' if len(x) > 50 else x
-    )
+    question_counts['Short_Question'] = [
+        q[:50] + '...' if len(q) > 50 else q for q in question_counts['Question']
+    ]
 
     fig = px.bar(
         question_counts,
@@ -276,320 +304,25 @@ def create_response_distribution(df):
     return fig
 
 # ==================== SENTIMENT ANALYSIS ====================
-# ==================== Question-Aware Sentiment Configuration ====================
-
-# Question context mapping - defines sentiment bias for each question
-QUESTION_CONTEXT = {
-    # Negative bias - these questions ask about problems/pain points
-    'challenges': ['What are the biggest challenges', 'operational challenges', 'biggest_challenges'],
-    'stop_doing': ['What should we STOP doing', 'stop doing', 'STOP'],
-
-    # Positive bias - these questions ask about strengths/initiatives
-    'start_doing': ['What should we START doing', 'start doing', 'START'],
-    'human_value': ['uniquely human', 'human value', 'humans'],
-    'team_culture': ['How would you describe', 'team culture', 'describe our team'],
-
-    # Neutral - informational questions
-    'ai_tools': ['AI tools', 'currently using', 'tools you use'],
-    'future_mission': ['future mission', '2 years', 'mission'],
-}
-
-# Gap/need indicator patterns - these indicate missing capabilities
-GAP_PATTERNS = [
-    r'\bmore\s+\w+',           # "more collaboration", "more support"
-    r'\bbetter\s+\w+',         # "better communication", "better tools"
-    r'\bneed\s+\w+',           # "need training", "need resources"
-    r'\bneeds?\s+to\b',        # "needs to improve", "need to change"
-    r'\bshould\s+\w+',         # "should focus", "should prioritize"
-    r'\blacking\b',            # "lacking clarity"
-    r'\bnot\s+enough\b',       # "not enough time"
-    r'\binsufficient\b',       # "insufficient resources"
-    r'\bwithout\b',            # "without proper support"
-    r'\blisten\s+more\b',      # "listen more" (specific case)
-    r'\bactive\s+listening\b', # "active listening" (specific case)
-    r'\bimprove\s+\w+',        # "improve processes"
-]
-
-# Negation patterns - indicate problems or dissatisfaction
-NEGATION_PATTERNS = [
-    r'\bno\s+\w+',             # "no support", "no time"
-    r'\bnot\b',                # "not working", "not effective"
-    r'\bdon\'?t\b',            # "don't have", "dont know"
-    r'\bcan\'?t\b',            # "can't access", "cant deliver"
-    r'\bnever\b',              # "never enough"
-    r'\bstop\b',               # "stop doing X"
-    r'\bavoid\b',              # "avoid meetings"
-]
-
-# Pain point keywords - explicitly negative in business context
-PAIN_KEYWORDS = [
-    'challenge', 'problem', 'issue', 'struggle', 'difficult', 'hard',
-    'frustrat', 'pain', 'blocker', 'obstacle', 'barrier', 'constraint',
-    'overwork', 'stretch', 'burn', 'overwhelm', 'stress', 'complain',
-    'incompetent', 'poor', 'bad', 'lack', 'miss', 'unavail', 'inadequate'
-]
-
-# Strength keywords - explicitly positive
-STRENGTH_KEYWORDS = [
-    'trust', 'empathy', 'connection', 'relationship', 'collaborat', 'support',
-    'innovat', 'creative', 'expert', 'knowledge', 'skill', 'passion',
-    'dedicated', 'commit', 'quality', 'excellent', 'strong', 'effective'
-]
-
-# ==================== Question-Aware Sentiment Functions ====================
-
-def preprocess_response(response):
-    """Preprocess response text for better sentiment analysis"""
-    if pd.isna(response) or not isinstance(response, str):
-        return ""
-    # Replace underscores with spaces for compound words
-    cleaned = response.replace('_', ' ')
-    # Remove extra whitespace
-    cleaned = ' '.join(cleaned.split())
-    return cleaned
-
-
-def detect_question_context(question_text):
-    """Detect the context/bias of a question based on its text"""
-    if pd.isna(question_text):
-        return 'neutral'
-
-    question_lower = question_text.lower()
-
-    # Check for negative bias questions (challenges, pain points)
-    for pattern in QUESTION_CONTEXT['challenges'] + QUESTION_CONTEXT['stop_doing']:
-        if pattern.lower() in question_lower:
-            return 'negative_bias'
-
-    # Check for positive bias questions (strengths, initiatives)
-    for pattern in QUESTION_CONTEXT['start_doing'] + QUESTION_CONTEXT['human_value']:
-        if pattern.lower() in question_lower:
-            return 'positive_bias'
-
-    return 'neutral'
-
-
-def detect_gap_indicators(response):
-    """Detect if response contains gap/need indicators"""
-    if not response:
-        return False
-
-    response_lower = response.lower()
-
-    for pattern in GAP_PATTERNS:
-        if re.search(pattern, response_lower):
-            return True
-
-    return False
-
-
-def detect_negation(response):
-    """Detect if response contains negation patterns"""
-    if not response:
-        return False
-
-    response_lower = response.lower()
-
-    for pattern in NEGATION_PATTERNS:
-        if re.search(pattern, response_lower):
-            return True
-
-    return False
-
-
-def contains_keywords(response, keywords):
-    """Check if response contains any keywords from a list"""
-    if not response:
-        return False
-
-    response_lower = response.lower()
-
-    for keyword in keywords:
-        if keyword in response_lower:
-            return True
-
-    return False
-
-
-def new_contextual_sentiment(response, question_text, question_context):
-    """
-    NEW: Question-aware contextual sentiment analysis
-
-    Args:
-        response: Response text
-        question_text: Full question text
-        question_context: Detected context ('negative_bias', 'positive_bias', 'neutral')
-
-    Returns:
-        tuple: (sentiment_label, confidence_score, reasoning)
-    """
-    from textblob import TextBlob
-
-    # Preprocess
-    cleaned_response = preprocess_response(response)
-
-    if not cleaned_response:
-        return 'Neutral', 0.5, 'Empty response'
-
-    # Get TextBlob baseline polarity with overrides for known quirks
-    # TextBlob has lexical issues with certain words (e.g., "base" = -0.8)
-    TEXTBLOB_OVERRIDES = {
-        'knowledge base': 0.1,      # TextBlob incorrectly gives -0.8 due to "base"
-        'base': 0.0,                # TextBlob incorrectly associates with "base instincts"
-        'poc': 0.0,                 # TextBlob may confuse with "pox"
-        'having a knowledge base': 0.2,  # Explicitly positive in survey context
-    }
-
-    response_lower = cleaned_response.lower()
-    base_polarity = None
-
-    # Check for overrides first
-    for phrase, override_polarity in TEXTBLOB_OVERRIDES.items():
-        if phrase in response_lower:
-            base_polarity = override_polarity
-            break
-
-    # Use TextBlob if no override found
-    if base_polarity is None:
-        try:
-            blob = TextBlob(cleaned_response)
-            base_polarity = blob.sentiment.polarity
-        except:
-            base_polarity = 0.0
-
-    # Initialize decision factors
-    reasoning_parts = []
-    sentiment_score = base_polarity  # Start with TextBlob baseline
-    confidence = 0.5
-
-    # RULE 1: Question context bias
-    if question_context == 'negative_bias':
-        sentiment_score -= 0.4
-        confidence = 0.8
-        reasoning_parts.append(f"Question has negative context")
-    elif question_context == 'positive_bias':
-        sentiment_score += 0.5  # Increased from 0.3 to better overcome TextBlob quirks
-        confidence = 0.7
-        reasoning_parts.append(f"Question has positive context")
-
-    # RULE 2: Gap/need indicators override positive words
-    has_gap_indicator = detect_gap_indicators(cleaned_response)
-    if has_gap_indicator:
-        sentiment_score -= 0.5
-        confidence = 0.9
-        reasoning_parts.append("Contains gap/need indicator (more/better/need/should)")
-
-    # RULE 2.5: Uncertainty detection (neutral, not negative)
-    UNCERTAINTY_PATTERNS = [r'\bnot sure\b', r'\bunsure\b', r'\bdon\'?t know\b', r'\buncertain\b']
-    has_uncertainty = any(re.search(pattern, response_lower) for pattern in UNCERTAINTY_PATTERNS)
-
-    # RULE 3: Negation patterns (but context-aware)
-    has_negation = detect_negation(cleaned_response)
-
-    # Special case: "stop" in positive_bias questions is constructive, not negative
-    # Example: "START doing: Stop spoon-feeding AE" is a positive suggestion to eliminate a pain point
-    if question_context == 'positive_bias' and 'stop' in response_lower and not has_uncertainty:
-        has_negation = False  # Override - this is a constructive suggestion, not a complaint
-
-    if has_uncertainty:
-        # Force neutral for uncertain responses like "I'm not sure"
-        sentiment_score = 0.0
-        confidence = 0.85
-        reasoning_parts.append("Expresses uncertainty")
-    elif has_negation:
-        sentiment_score -= 0.4
-        confidence = 0.85
-        reasoning_parts.append("Contains negation pattern (no/not/stop/can't)")
-
-    # RULE 4: Pain point keywords
-    if contains_keywords(cleaned_response, PAIN_KEYWORDS):
-        sentiment_score -= 0.3
-        confidence = max(confidence, 0.8)
-        reasoning_parts.append("Contains pain point keywords")
-
-    # RULE 5: Strength keywords (BUT not if gap indicator present - gaps take priority)
-    if contains_keywords(cleaned_response, STRENGTH_KEYWORDS) and not has_gap_indicator:
-        sentiment_score += 0.3
-        confidence = max(confidence, 0.8)
-        reasoning_parts.append("Contains strength keywords")
-
-    # RULE 6: Short responses (1-3 words) inherit more question context
-    word_count = len(cleaned_response.split())
-    if word_count <= 3:
-        if question_context == 'negative_bias':
-            sentiment_score -= 0.2
-            reasoning_parts.append("Short response in negative context")
-        elif question_context == 'positive_bias':
-            sentiment_score += 0.2
-            reasoning_parts.append("Short response in positive context")
-
-    # RULE 7: Specific edge cases
-    response_lower = cleaned_response.lower()
-
-    # "listen more", "active listening" → Negative (indicates gap)
-    if 'listen' in response_lower and ('more' in response_lower or 'active' in response_lower):
-        sentiment_score = -0.6
-        confidence = 0.95
-        reasoning_parts.append("Listening gap indicator (listen more/active listening)")
-
-    # POC in "stop doing" context → Negative
-    if 'poc' in response_lower and question_context == 'negative_bias':
-        sentiment_score = -0.5
-        confidence = 0.9
-        reasoning_parts.append("POC in negative context (pain point)")
-
-    # Final classification based on adjusted score
-    if sentiment_score > 0.1:
-        final_sentiment = 'Positive'
-    elif sentiment_score < -0.1:
-        final_sentiment = 'Negative'
-    else:
-        final_sentiment = 'Neutral'
-
-    # Build reasoning summary
-    if not reasoning_parts:
-        reasoning_parts.append(f"TextBlob polarity: {base_polarity:.2f}")
-
-    reasoning = '; '.join(reasoning_parts)
-
-    return final_sentiment, confidence, reasoning
-
+# Display labels for each detected question context
+CONTEXT_EMOJI = {"negative_bias": "⚠️", "positive_bias": "✅", "neutral": "ℹ️"}
+CONTEXT_LABEL = {"negative_bias": "Negative Bias (Pain Points/Challenges)",
+                 "positive_bias": "Positive Bias (Strengths/Initiatives)",
+                 "neutral": "Neutral (Informational)"}
 
 @st.cache_data
-def analyze_sentiment(responses, question_text):
-    """Question-aware sentiment analysis with context understanding"""
-    # Detect question context
-    question_context = detect_question_context(question_text)
-
-    sentiments = []
-    for response in responses:
-        sentiment, confidence, reasoning = new_contextual_sentiment(
-            response, question_text, question_context
-        )
-
-        sentiments.append({
-            'response': response,
-            'sentiment': sentiment,
-            'confidence': confidence,
-            'reasoning': reasoning
-        })
-
-    return pd.DataFrame(sentiments)
+def analyze_sentiment(responses, question_text, question_context=None):
+    """Question-aware sentiment analysis with context understanding (cached per question)"""
+    return analyze_responses(responses, question_text, question_context)
 
 def create_sentiment_chart(sentiment_df):
     """Create sentiment distribution chart"""
     sentiment_counts = sentiment_df['sentiment'].value_counts()
 
-    colors = {
-        'Positive': COLOR_SCHEME['positive'],
-        'Neutral': COLOR_SCHEME['neutral'],
-        'Negative': COLOR_SCHEME['negative']
-    }
-
     fig = go.Figure(data=[go.Pie(
         labels=sentiment_counts.index,
         values=sentiment_counts.values,
-        marker=dict(colors=[colors.get(s, COLOR_SCHEME['primary_blue']) for s in sentiment_counts.index]),
+        marker=dict(colors=[SENTIMENT_COLORS.get(s, COLOR_SCHEME['primary_blue']) for s in sentiment_counts.index]),
         hole=0.3
     )])
 
@@ -686,7 +419,7 @@ def main():
             st.caption("Assuming ~100 respondents")
         with col3:
             st.metric("Top Role", "Solution Architects")
-            st.caption(f"{roles_df.iloc[0]['Votes']} votes ({roles_df.iloc[0]['Percentage']}%)")
+            st.caption(f"{roles_df['Votes'].iat[0]} votes ({roles_df['Percentage'].iat[0]}%)")
 
         # Visualization
         fig_roles = go.Figure([go.Bar(
@@ -715,8 +448,8 @@ def main():
         # Key insights
         st.markdown('<div class="insight-box">', unsafe_allow_html=True)
         st.markdown("**💡 Key Insights:**")
-        st.markdown(f"- **Solution Architects** remain the core role ({roles_df.iloc[0]['Percentage']}% selection rate)")
-        st.markdown(f"- **Innovation Leads** rising as second priority ({roles_df.iloc[1]['Percentage']}%) - focus on co-creation")
+        st.markdown(f"- **Solution Architects** remain the core role ({roles_df['Percentage'].iat[0]}% selection rate)")
+        st.markdown(f"- **Innovation Leads** rising as second priority ({roles_df['Percentage'].iat[1]}%) - focus on co-creation")
         st.markdown(f"- **Portfolio approach:** Average {roles_df['Votes'].sum() / 100:.1f} roles per person → need for specialization")
         st.markdown(f"- **Balanced distribution:** No single role dominates (all roles 12-27%)")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -743,7 +476,7 @@ def main():
             st.caption(", ".join(top_skills['Skillset'].tolist()[:2]))
         with col3:
             st.metric("Technical Expertise Ranking", "4th place")
-            st.caption(f"Only {skills_df[skills_df['Skillset'] == 'Technical expertise']['Percentage'].iloc[0]}% ranked it #1")
+            st.caption(f"Only {skills_df.loc[skills_df['Skillset'] == 'Technical expertise', 'Percentage'].iat[0]}% ranked it #1")
 
         # Visualization
         fig_skills = go.Figure([go.Bar(
@@ -772,10 +505,10 @@ def main():
         # Key insights
         st.markdown('<div class="insight-box">', unsafe_allow_html=True)
         st.markdown("**💡 Key Insights:**")
-        st.markdown(f"- **TIED for #1:** Industry-specific acumen & Advanced storytelling (30 votes each, {skills_df.iloc[0]['Percentage']}%)")
+        st.markdown(f"- **TIED for #1:** Industry-specific acumen & Advanced storytelling (30 votes each, {skills_df['Percentage'].iat[0]}%)")
         st.markdown(f"- **Shift observed:** Business skills > Technical skills (Industry acumen #1 vs Technical expertise #4)")
         st.markdown(f"- **Surprising:** Financial modelling = 0 first-place votes (may be delegated or not seen as primary skill)")
-        st.markdown(f"- **Soft skills valued:** Adaptability & empathy in 2nd place ({skills_df.iloc[2]['Percentage']}%)")
+        st.markdown(f"- **Soft skills valued:** Adaptability & empathy in 2nd place ({skills_df['Percentage'].iat[2]}%)")
         st.markdown(f"- **Strategic implication:** Presales evolving from technical-first to business-first orientation")
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -810,11 +543,12 @@ def main():
         st.markdown('<div class="sub-header">Question Deep Dive</div>', unsafe_allow_html=True)
 
         # Question selector
-        questions = sorted(df['Question'].unique())
+        question_groups = get_question_groups(df)
+        questions = sorted(question_groups)
         selected_question = st.selectbox("Select a question to analyze:", questions)
 
         # Filter data
-        question_df = df[df['Question'] == selected_question]
+        question_df = question_groups[selected_question]
 
         # Metrics
         col1, col2 = st.columns(2)
@@ -834,9 +568,12 @@ def main():
             if wordcloud_fig:
                 st.pyplot(wordcloud_fig)
 
+        # Clean/lowercase the responses once for both the top-10 list and the top-20 chart
+        top_words_full = get_top_words(question_df['Response'], top_n=20)
+
         with col2:
             st.markdown("### Top 10 Words")
-            top_words = get_top_words(question_df['Response'], top_n=10)
+            top_words = top_words_full[:10]
             if top_words:
                 for word, count in top_words:
                     st.markdown(f"**{word}:** {count}")
@@ -844,7 +581,6 @@ def main():
         # Frequency chart
         st.markdown("---")
         st.markdown("### Word Frequency Distribution")
-        top_words_full = get_top_words(question_df['Response'], top_n=20)
         freq_chart = create_frequency_chart(top_words_full, "Top 20 Words by Frequency")
         if freq_chart:
             st.plotly_chart(freq_chart, use_container_width=True)
@@ -855,33 +591,33 @@ def main():
         num_samples = min(10, len(question_df))
         sample_responses = question_df['Response'].sample(n=num_samples).tolist()
 
-        for i, response in enumerate(sample_responses, 1):
-            st.markdown(f'<div class="quote-box">{i}. "{response}"</div>', unsafe_allow_html=True)
+        st.markdown('\n'.join(
+            f'<div class="quote-box">{i}. "{response}"</div>'
+            for i, response in enumerate(sample_responses, 1)
+        ), unsafe_allow_html=True)
 
     # ==================== SENTIMENT ANALYSIS ====================
     elif analysis_mode == "💭 Sentiment Analysis":
         st.markdown('<div class="sub-header">Sentiment Analysis</div>', unsafe_allow_html=True)
 
         # Question selector
-        questions = sorted(df['Question'].unique())
+        question_groups = get_question_groups(df)
+        questions = sorted(question_groups)
         selected_question = st.selectbox("Select a question for sentiment analysis:", questions)
 
         # Filter data
-        question_df = df[df['Question'] == selected_question]
+        question_df = question_groups[selected_question]
+
+        # Detect question context once - reused for the analysis and the display below
+        question_context = detect_question_context(selected_question)
 
         # Run sentiment analysis
         with st.spinner("Analyzing sentiment..."):
-            sentiment_df = analyze_sentiment(question_df['Response'].tolist(), selected_question)
+            sentiment_df = analyze_sentiment(question_df['Response'].tolist(), selected_question, question_context)
 
         # Display question context
-        question_context = detect_question_context(selected_question)
-        context_emoji = {"negative_bias": "⚠️", "positive_bias": "✅", "neutral": "ℹ️"}
-        context_label = {"negative_bias": "Negative Bias (Pain Points/Challenges)",
-                       "positive_bias": "Positive Bias (Strengths/Initiatives)",
-                       "neutral": "Neutral (Informational)"}
-
         st.markdown(f'<div class="insight-box">', unsafe_allow_html=True)
-        st.markdown(f"**{context_emoji.get(question_context, 'ℹ️')} Question Context:** {context_label.get(question_context, 'Neutral')}")
+        st.markdown(f"**{CONTEXT_EMOJI.get(question_context, 'ℹ️')} Question Context:** {CONTEXT_LABEL.get(question_context, 'Neutral')}")
         st.markdown(f"**Average Confidence:** {sentiment_df['confidence'].mean():.2f}")
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -893,51 +629,57 @@ def main():
 
         with col2:
             st.markdown("### Sentiment Summary")
-            sentiment_counts = sentiment_df['sentiment'].value_counts()
-            total = len(sentiment_df)
+            sentiment_counts = sentiment_df['sentiment'].value_counts().reindex(
+                ['Positive', 'Neutral', 'Negative'], fill_value=0
+            )
+            sentiment_pcts = sentiment_counts / len(sentiment_df) * 100
 
-            for sentiment in ['Positive', 'Neutral', 'Negative']:
-                if sentiment in sentiment_counts.index:
-                    count = sentiment_counts[sentiment]
-                    pct = (count / total) * 100
-                    st.markdown(f"**{sentiment}:** {count} responses ({pct:.1f}%)")
-                else:
-                    st.markdown(f"**{sentiment}:** 0 responses (0.0%)")
+            for sentiment, count in sentiment_counts.items():
+                st.markdown(f"**{sentiment}:** {count} responses ({sentiment_pcts[sentiment]:.1f}%)")
 
         # Top responses by sentiment (3 columns: Positive, Neutral, Negative)
         st.markdown("---")
         col1, col2, col3 = st.columns(3)
 
+        # Partition by label once instead of one boolean mask per column
+        responses_by_sentiment = dict(tuple(sentiment_df.groupby('sentiment', sort=False)))
+
         with col1:
             st.markdown("### 👍 Most Positive")
-            positive_df = sentiment_df[sentiment_df['sentiment'] == 'Positive']
+            positive_df = responses_by_sentiment.get('Positive')
 
-            if len(positive_df) > 0:
+            if positive_df is not None:
                 positive_df = positive_df.nlargest(5, 'confidence')
-                for idx, row in positive_df.iterrows():
-                    st.markdown(f'<div class="quote-box">"{row["response"]}"<br><small>Confidence: {row["confidence"]:.2f}</small></div>', unsafe_allow_html=True)
+                st.markdown('\n'.join(
+                    f'<div class="quote-box">"{response}"<br><small>Confidence: {confidence:.2f}</small></div>'
+                    for response, confidence in positive_df[['response', 'confidence']].itertuples(index=False, name=None)
+                ), unsafe_allow_html=True)
             else:
                 st.info("No positive responses")
 
         with col2:
             st.markdown("### ⚖️ Most Neutral")
-            neutral_df = sentiment_df[sentiment_df['sentiment'] == 'Neutral']
+            neutral_df = responses_by_sentiment.get('Neutral')
 
-            if len(neutral_df) > 0:
+            if neutral_df is not None:
                 neutral_df = neutral_df.nlargest(5, 'confidence')
-                for idx, row in neutral_df.iterrows():
-                    st.markdown(f'<div class="quote-box">"{row["response"]}"<br><small>Confidence: {row["confidence"]:.2f}</small></div>', unsafe_allow_html=True)
+                st.markdown('\n'.join(
+                    f'<div class="quote-box">"{response}"<br><small>Confidence: {confidence:.2f}</small></div>'
+                    for response, confidence in neutral_df[['response', 'confidence']].itertuples(index=False, name=None)
+                ), unsafe_allow_html=True)
             else:
                 st.info("No neutral responses")
 
         with col3:
             st.markdown("### 👎 Most Negative")
-            negative_df = sentiment_df[sentiment_df['sentiment'] == 'Negative']
+            negative_df = responses_by_sentiment.get('Negative')
 
-            if len(negative_df) > 0:
+            if negative_df is not None:
                 negative_df = negative_df.nlargest(5, 'confidence')
-                for idx, row in negative_df.iterrows():
-                    st.markdown(f'<div class="quote-box">"{row["response"]}"<br><small>Confidence: {row["confidence"]:.2f}</small></div>', unsafe_allow_html=True)
+                st.markdown('\n'.join(
+                    f'<div class="quote-box">"{response}"<br><small>Confidence: {confidence:.2f}</small></div>'
+                    for response, confidence in negative_df[['response', 'confidence']].itertuples(index=False, name=None)
+                ), unsafe_allow_html=True)
             else:
                 st.info("No negative responses")
 
@@ -947,8 +689,9 @@ def main():
         st.markdown("Identifying immediate action items from **Stop Doing** and **Start Doing** responses")
 
         # Find Stop/Start questions
-        stop_questions = [q for q in df['Question'].unique() if 'stop' in q.lower()]
-        start_questions = [q for q in df['Question'].unique() if 'start' in q.lower()]
+        question_lower = {q: q.lower() for q in df['Question'].unique()}
+        stop_questions = [q for q, lower in question_lower.items() if 'stop' in lower]
+        start_questions = [q for q, lower in question_lower.items() if 'start' in lower]
 
         if stop_questions or start_questions:
             col1, col2 = st.columns(2)
@@ -1007,7 +750,8 @@ def main():
         st.markdown("Compare responses across related questions to identify patterns and gaps")
 
         # Question pair selector
-        questions = sorted(df['Question'].unique())
+        question_groups = get_question_groups(df)
+        questions = sorted(question_groups)
 
         col1, col2 = st.columns(2)
         with col1:
@@ -1019,8 +763,8 @@ def main():
             st.warning("Please select two different questions for comparison.")
         else:
             # Get data for both questions
-            q1_df = df[df['Question'] == question_1]
-            q2_df = df[df['Question'] == question_2]
+            q1_df = question_groups[question_1]
+            q2_df = question_groups[question_2]
 
             # Side-by-side comparison
             col1, col2 = st.columns(2)
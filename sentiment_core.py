@@ -0,0 +1,410 @@
+"""
+Question-Aware Sentiment Analysis
+Contextual sentiment engine behind the dashboard - importable without Streamlit
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# ==================== Question-Aware Sentiment Configuration ====================
+
+# Question context mapping - defines sentiment bias for each question
+QUESTION_CONTEXT = {
+    # Negative bias - these questions ask about problems/pain points
+    'challenges': ['What are the biggest challenges', 'operational challenges', 'biggest_challenges'],
+    'stop_doing': ['What should we STOP doing', 'stop doing', 'STOP'],
+
+    # Positive bias - these questions ask about strengths/initiatives
+    'start_doing': ['What should we START doing', 'start doing', 'START'],
+    'human_value': ['uniquely human', 'human value', 'humans'],
+    'team_culture': ['How would you describe', 'team culture', 'describe our team'],
+
+    # Neutral - informational questions
+    'ai_tools': ['AI tools', 'currently using', 'tools you use'],
+    'future_mission': ['future mission', '2 years', 'mission'],
+}
+
+# Bias patterns fused into one case-insensitive regex per class for detect_question_context()
+NEGATIVE_CONTEXT_REGEX = re.compile(
+    '|'.join(map(re.escape, QUESTION_CONTEXT['challenges'] + QUESTION_CONTEXT['stop_doing'])), re.IGNORECASE
+)
+POSITIVE_CONTEXT_REGEX = re.compile(
+    '|'.join(map(re.escape, QUESTION_CONTEXT['start_doing'] + QUESTION_CONTEXT['human_value'])), re.IGNORECASE
+)
+
+# Gap/need indicator patterns - these indicate missing capabilities
+GAP_PATTERNS = [
+    r'\bmore\s+\w+',           # "more collaboration", "more support"
+    r'\bbetter\s+\w+',         # "better communication", "better tools"
+    r'\bneed\s+\w+',           # "need training", "need resources"
+    r'\bneeds?\s+to\b',        # "needs to improve", "need to change"
+    r'\bshould\s+\w+',         # "should focus", "should prioritize"
+    r'\blacking\b',            # "lacking clarity"
+    r'\bnot\s+enough\b',       # "not enough time"
+    r'\binsufficient\b',       # "insufficient resources"
+    r'\bwithout\b',            # "without proper support"
+    r'\blisten\s+more\b',      # "listen more" (specific case)
+    r'\bactive\s+listening\b', # "active listening" (specific case)
+    r'\bimprove\s+\w+',        # "improve processes"
+]
+
+# Negation patterns - indicate problems or dissatisfaction
+NEGATION_PATTERNS = [
+    r'\bno\s+\w+',             # "no support", "no time"
+    r'\bnot\b',                # "not working", "not effective"
+    r'\bdon\'?t\b',            # "don't have", "dont know"
+    r'\bcan\'?t\b',            # "can't access", "cant deliver"
+    r'\bnever\b',              # "never enough"
+    r'\bstop\b',               # "stop doing X"
+    r'\bavoid\b',              # "avoid meetings"
+]
+
+# Uncertainty patterns - "I'm not sure" answers are neutral, not negative
+UNCERTAINTY_PATTERNS = [r'\bnot sure\b', r'\bunsure\b', r'\bdon\'?t know\b', r'\buncertain\b']
+
+# Pain point keywords - explicitly negative in business context
+PAIN_KEYWORDS = [
+    'challenge', 'problem', 'issue', 'struggle', 'difficult', 'hard',
+    'frustrat', 'pain', 'blocker', 'obstacle', 'barrier', 'constraint',
+    'overwork', 'stretch', 'burn', 'overwhelm', 'stress', 'complain',
+    'incompetent', 'poor', 'bad', 'lack', 'miss', 'unavail', 'inadequate'
+]
+
+# Strength keywords - explicitly positive
+STRENGTH_KEYWORDS = [
+    'trust', 'empathy', 'connection', 'relationship', 'collaborat', 'support',
+    'innovat', 'creative', 'expert', 'knowledge', 'skill', 'passion',
+    'dedicated', 'commit', 'quality', 'excellent', 'strong', 'effective'
+]
+
+# TextBlob polarity overrides - TextBlob has lexical issues with certain words (e.g., "base" = -0.8)
+TEXTBLOB_OVERRIDES = {
+    'knowledge base': 0.1,      # TextBlob incorrectly gives -0.8 due to "base"
+    'base': 0.0,                # TextBlob incorrectly associates with "base instincts"
+    'poc': 0.0,                 # TextBlob may confuse with "pox"
+    'having a knowledge base': 0.2,  # Explicitly positive in survey context
+}
+
+# Each pattern/keyword list fused into one case-insensitive alternation, compiled
+# once at import - the detectors below scan every response a single time
+GAP_REGEX = re.compile('|'.join(f'(?:{pattern})' for pattern in GAP_PATTERNS), re.IGNORECASE)
+NEGATION_REGEX = re.compile('|'.join(f'(?:{pattern})' for pattern in NEGATION_PATTERNS), re.IGNORECASE)
+UNCERTAINTY_REGEX = re.compile('|'.join(f'(?:{pattern})' for pattern in UNCERTAINTY_PATTERNS), re.IGNORECASE)
+PAIN_KEYWORDS_REGEX = re.compile('|'.join(map(re.escape, PAIN_KEYWORDS)), re.IGNORECASE)
+STRENGTH_KEYWORDS_REGEX = re.compile('|'.join(map(re.escape, STRENGTH_KEYWORDS)), re.IGNORECASE)
+
+# Every TEXTBLOB_OVERRIDES phrase, longest first; the lookahead reports overlapping
+# matches so get_base_polarity() can pick the longest phrase in the response
+OVERRIDES_REGEX = re.compile(
+    '(?=(' + '|'.join(map(re.escape, sorted(TEXTBLOB_OVERRIDES, key=len, reverse=True))) + '))'
+)
+
+# Runs of underscores/whitespace, collapsed to a single space by preprocess_response()
+UNDERSCORE_WHITESPACE_REGEX = re.compile(r'[_\s]+')
+
+# ==================== Question-Aware Sentiment Functions ====================
+
+def preprocess_response(response):
+    """Preprocess response text for better sentiment analysis"""
+    if pd.isna(response) or not isinstance(response, str):
+        return ""
+    # Replace underscores with spaces for compound words and collapse
+    # extra whitespace in a single pass
+    return UNDERSCORE_WHITESPACE_REGEX.sub(' ', response).strip()
+
+
+@lru_cache(maxsize=256)
+def detect_question_context(question_text):
+    """Detect the context/bias of a question based on its text (memoized - questions repeat per row)"""
+    if pd.isna(question_text):
+        return 'neutral'
+
+    # Check for negative bias questions (challenges, pain points)
+    if NEGATIVE_CONTEXT_REGEX.search(question_text):
+        return 'negative_bias'
+
+    # Check for positive bias questions (strengths, initiatives)
+    if POSITIVE_CONTEXT_REGEX.search(question_text):
+        return 'positive_bias'
+
+    return 'neutral'
+
+
+@lru_cache(maxsize=2048)
+def detect_gap_indicators(response):
+    """Detect if response contains gap/need indicators"""
+    if not response:
+        return False
+
+    return GAP_REGEX.search(response) is not None
+
+
+def detect_negation(response):
+    """Detect if response contains negation patterns"""
+    if not response:
+        return False
+
+    return NEGATION_REGEX.search(response) is not None
+
+
+def contains_keywords(response, keywords_regex):
+    """Check if response contains any keyword matched by a fused keyword regex"""
+    if not response:
+        return False
+
+    return keywords_regex.search(response) is not None
+
+
+@lru_cache(maxsize=1)
+def _pattern_sentiment():
+    """TextBlob's pattern sentiment lexicon - what TextBlob(text).sentiment delegates to"""
+    from textblob.en import sentiment
+    return sentiment
+
+
+@lru_cache(maxsize=4096)
+def textblob_polarity(text):
+    """
+    Raw TextBlob polarity, memoized by text
+
+    Survey answers repeat heavily ("Trust", "POC", "More collaboration") across
+    questions and reruns; only the float is cached, not the TextBlob object.
+    Calls the pattern lexicon directly - PatternAnalyzer.analyze() builds a new
+    namedtuple class on every call.
+    """
+    pattern_sentiment = _pattern_sentiment()
+
+    # A lone word the lexicon doesn't know always scores 0.0
+    if text.isalpha() and text.lower() not in pattern_sentiment:
+        return 0.0
+
+    try:
+        return pattern_sentiment(text)[0]
+    except:
+        return 0.0
+
+
+def get_base_polarity(cleaned_response, response_lower):
+    """TextBlob polarity for a preprocessed response, with overrides for known quirks"""
+    # Check for overrides first - the longest matching phrase wins, so
+    # "having a knowledge base" beats "knowledge base" beats "base"
+    override_phrase = max(
+        (match.group(1) for match in OVERRIDES_REGEX.finditer(response_lower)), key=len, default=None
+    )
+    if override_phrase is not None:
+        return TEXTBLOB_OVERRIDES[override_phrase]
+
+    # Use TextBlob if no override found
+    return textblob_polarity(cleaned_response)
+
+
+def score_sentiment(base_polarity, question_context, features):
+    """
+    Apply the contextual sentiment rules to a batch of extracted response features
+
+    Each rule is a branch-free masked update over whole columns, applied in rule
+    order so every score matches evaluating the rules one response at a time.
+
+    Args:
+        base_polarity: TextBlob baseline polarities (see get_base_polarity)
+        question_context: Detected context ('negative_bias', 'positive_bias', 'neutral')
+        features: Mapping of feature name -> per-response values (see analyze_responses)
+
+    Returns:
+        tuple: (sentiment_labels, confidence_scores, reasonings) arrays
+    """
+    base_polarity = np.asarray(base_polarity, dtype=float)
+    has_gap_indicator = np.asarray(features['has_gap_indicator'], dtype=bool)
+    has_uncertainty = np.asarray(features['has_uncertainty'], dtype=bool)
+    has_negation = np.asarray(features['has_negation'], dtype=bool)
+    mentions_stop = np.asarray(features['mentions_stop'], dtype=bool)
+    has_pain = np.asarray(features['has_pain'], dtype=bool)
+    has_strength = np.asarray(features['has_strength'], dtype=bool)
+    is_short = np.asarray(features['word_count'], dtype=int) <= 3
+    mentions_listen_gap = np.asarray(features['mentions_listen_gap'], dtype=bool)
+    mentions_poc = np.asarray(features['mentions_poc'], dtype=bool)
+
+    # Initialize decision factors
+    sentiment_score = base_polarity.copy()  # Start with TextBlob baseline
+    confidence = np.full(len(base_polarity), 0.5)
+    reasoning = np.full(len(base_polarity), '', dtype=object)  # "; "-terminated parts
+
+    # RULE 1: Question context bias (one question per batch, so a uniform shift)
+    if question_context == 'negative_bias':
+        sentiment_score -= 0.4
+        confidence[:] = 0.8
+        reasoning += "Question has negative context; "
+    elif question_context == 'positive_bias':
+        sentiment_score += 0.5  # Increased from 0.3 to better overcome TextBlob quirks
+        confidence[:] = 0.7
+        reasoning += "Question has positive context; "
+
+    # RULE 2: Gap/need indicators override positive words
+    sentiment_score -= 0.5 * has_gap_indicator
+    confidence = np.where(has_gap_indicator, 0.9, confidence)
+    reasoning = np.where(has_gap_indicator, reasoning + "Contains gap/need indicator (more/better/need/should); ", reasoning)
+
+    # RULE 3: Negation patterns (but context-aware)
+    # Special case: "stop" in positive_bias questions is constructive, not negative
+    # Example: "START doing: Stop spoon-feeding AE" is a positive suggestion to eliminate a pain point
+    if question_context == 'positive_bias':
+        has_negation = has_negation & ~(mentions_stop & ~has_uncertainty)
+
+    # RULE 2.5: Uncertainty detection (neutral, not negative) - forces neutral for
+    # uncertain responses like "I'm not sure", otherwise negation applies
+    applies_negation = has_negation & ~has_uncertainty
+    sentiment_score = np.where(has_uncertainty, 0.0, sentiment_score - 0.4 * applies_negation)
+    confidence = np.where(has_uncertainty | applies_negation, 0.85, confidence)
+    reasoning = np.where(has_uncertainty, reasoning + "Expresses uncertainty; ", reasoning)
+    reasoning = np.where(applies_negation, reasoning + "Contains negation pattern (no/not/stop/can't); ", reasoning)
+
+    # RULE 4: Pain point keywords
+    sentiment_score -= 0.3 * has_pain
+    confidence = np.where(has_pain, np.maximum(confidence, 0.8), confidence)
+    reasoning = np.where(has_pain, reasoning + "Contains pain point keywords; ", reasoning)
+
+    # RULE 5: Strength keywords (BUT not if gap indicator present - gaps take priority)
+    applies_strength = has_strength & ~has_gap_indicator
+    sentiment_score += 0.3 * applies_strength
+    confidence = np.where(applies_strength, np.maximum(confidence, 0.8), confidence)
+    reasoning = np.where(applies_strength, reasoning + "Contains strength keywords; ", reasoning)
+
+    # RULE 6: Short responses (1-3 words) inherit more question context
+    if question_context == 'negative_bias':
+        sentiment_score -= 0.2 * is_short
+        reasoning = np.where(is_short, reasoning + "Short response in negative context; ", reasoning)
+    elif question_context == 'positive_bias':
+        sentiment_score += 0.2 * is_short
+        reasoning = np.where(is_short, reasoning + "Short response in positive context; ", reasoning)
+
+    # RULE 7: Specific edge cases
+    # "listen more", "active listening" → Negative (indicates gap)
+    sentiment_score = np.where(mentions_listen_gap, -0.6, sentiment_score)
+    confidence = np.where(mentions_listen_gap, 0.95, confidence)
+    reasoning = np.where(mentions_listen_gap, reasoning + "Listening gap indicator (listen more/active listening); ", reasoning)
+
+    # POC in "stop doing" context → Negative
+    if question_context == 'negative_bias':
+        sentiment_score = np.where(mentions_poc, -0.5, sentiment_score)
+        confidence = np.where(mentions_poc, 0.9, confidence)
+        reasoning = np.where(mentions_poc, reasoning + "POC in negative context (pain point); ", reasoning)
+
+    # Final classification based on adjusted score
+    final_sentiment = np.select(
+        [sentiment_score > 0.1, sentiment_score < -0.1], ['Positive', 'Negative'], 'Neutral'
+    ).astype(object)
+
+    # Build reasoning summary
+    reasoning = np.array([
+        parts[:-2] if parts else f"TextBlob polarity: {polarity:.2f}"
+        for parts, polarity in zip(reasoning, base_polarity)
+    ], dtype=object)
+
+    return final_sentiment, confidence, reasoning
+
+
+def new_contextual_sentiment(response, question_text, question_context):
+    """
+    NEW: Question-aware contextual sentiment analysis
+
+    Args:
+        response: Response text
+        question_text: Full question text
+        question_context: Detected context ('negative_bias', 'positive_bias', 'neutral')
+
+    Returns:
+        tuple: (sentiment_label, confidence_score, reasoning)
+    """
+    # Preprocess
+    cleaned_response = preprocess_response(response)
+
+    if not cleaned_response:
+        return 'Neutral', 0.5, 'Empty response'
+
+    response_lower = cleaned_response.lower()
+
+    # Score as a batch of one so both entry points share score_sentiment()
+    sentiment_labels, confidences, reasonings = score_sentiment(
+        [get_base_polarity(cleaned_response, response_lower)],
+        question_context,
+        {
+            'has_gap_indicator': [detect_gap_indicators(cleaned_response)],
+            'has_uncertainty': [UNCERTAINTY_REGEX.search(cleaned_response) is not None],
+            'has_negation': [detect_negation(cleaned_response)],
+            'mentions_stop': ['stop' in response_lower],
+            'has_pain': [contains_keywords(cleaned_response, PAIN_KEYWORDS_REGEX)],
+            'has_strength': [contains_keywords(cleaned_response, STRENGTH_KEYWORDS_REGEX)],
+            'word_count': [len(cleaned_response.split())],
+            'mentions_listen_gap': ['listen' in response_lower and ('more' in response_lower or 'active' in response_lower)],
+            'mentions_poc': ['poc' in response_lower],
+        },
+    )
+
+    return sentiment_labels[0], float(confidences[0]), reasonings[0]
+
+
+def analyze_responses(responses, question_text, question_context=None):
+    """
+    Question-aware sentiment analysis for all responses to one question
+
+    Args:
+        responses: List of response texts
+        question_text: Full question text
+        question_context: Detected context, or None to detect it from question_text
+
+    Returns:
+        DataFrame: response, sentiment, confidence, reasoning
+    """
+    # Detect question context unless the caller already has it
+    if question_context is None:
+        question_context = detect_question_context(question_text)
+
+    # Preprocess column-wise - same result as preprocess_response() per row,
+    # with non-text responses (NaN/None/numbers) cleaned to ''
+    raw = pd.Series(responses, dtype=object)
+    cleaned = (
+        raw.where(raw.apply(isinstance, args=(str,)), '')
+        .str.replace(UNDERSCORE_WHITESPACE_REGEX, ' ', regex=True)
+        .str.strip()
+    )
+    response_lower = cleaned.str.lower()
+
+    # Extract every rule feature column-wise (one vectorised pass per rule)
+    features = pd.DataFrame({
+        'has_gap_indicator': cleaned.str.contains(GAP_REGEX),
+        'has_uncertainty': cleaned.str.contains(UNCERTAINTY_REGEX),
+        'has_negation': cleaned.str.contains(NEGATION_REGEX),
+        'mentions_stop': response_lower.str.contains('stop', regex=False),
+        'has_pain': cleaned.str.contains(PAIN_KEYWORDS_REGEX),
+        'has_strength': cleaned.str.contains(STRENGTH_KEYWORDS_REGEX),
+        'word_count': cleaned.str.split().str.len(),
+        'mentions_listen_gap': response_lower.str.contains('listen', regex=False) & (
+            response_lower.str.contains('more', regex=False) | response_lower.str.contains('active', regex=False)
+        ),
+        'mentions_poc': response_lower.str.contains('poc', regex=False),
+    })
+
+    # TextBlob is the expensive step and survey answers repeat a lot ("Trust",
+    # "Collaborative"), so compute polarity once per distinct response
+    lower_by_text = dict(zip(cleaned, response_lower))
+    polarity_by_text = {text: get_base_polarity(text, lower) for text, lower in lower_by_text.items() if text}
+    polarities = cleaned.map(polarity_by_text).fillna(0.0)
+
+    sentiment_labels, confidences, reasonings = score_sentiment(polarities, question_context, features)
+
+    # Empty responses bypass the rules
+    is_empty = (cleaned == '').to_numpy()
+    sentiment_labels[is_empty] = 'Neutral'
+    confidences[is_empty] = 0.5
+    reasonings[is_empty] = 'Empty response'
+
+    # Build the frame column-wise rather than from one dict per response
+    return pd.DataFrame({
+        'response': responses,
+        'sentiment': sentiment_labels,
+        'confidence': confidences,
+        'reasoning': reasonings
+    })
@@ -0,0 +1,55 @@
+"""
+Tests for the contextual sentiment engine (run with: python -m pytest -q)
+"""
+
+import pytest
+
+from sentiment_core import (
+    analyze_responses,
+    detect_question_context,
+    get_base_polarity,
+    new_contextual_sentiment,
+)
+
+# One question per context - negative_bias, positive_bias, neutral
+QUESTIONS = [
+    'What are the biggest challenges you face?',
+    'What should we START doing?',
+    'Which AI tools are you currently using?',
+]
+
+RESPONSES = [
+    'Trust',
+    'POC',
+    'More collaboration with product teams',
+    'Stop spoon-feeding AE',
+    "I'm not sure",
+    'Having_a_knowledge_base',
+    'Not enough time, too many internal meetings',
+    'listen more to customers',
+    'Great team with strong expertise',
+    '',
+]
+
+
+@pytest.mark.parametrize('response, expected', [
+    ('having a knowledge base', 0.2),
+    ('knowledge base', 0.1),
+    ('database', 0.0),
+])
+def test_longest_override_phrase_wins(response, expected):
+    assert get_base_polarity(response, response.lower()) == expected
+
+
+def test_questions_cover_every_context():
+    assert [detect_question_context(q) for q in QUESTIONS] == ['negative_bias', 'positive_bias', 'neutral']
+
+
+@pytest.mark.parametrize('question', QUESTIONS)
+def test_batch_matches_single_response(question):
+    question_context = detect_question_context(question)
+    batch = analyze_responses(RESPONSES, question, question_context)
+
+    single = [new_contextual_sentiment(response, question, question_context) for response in RESPONSES]
+
+    assert list(batch[['sentiment', 'confidence', 'reasoning']].itertuples(index=False, name=None)) == single